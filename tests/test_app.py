@@ -2,250 +2,193 @@
 Tests for the Mergington High School Activities API
 """
 
+import asyncio
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
 
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import app as app_module
+from app import app
 
-from app import app, activities
 
+# Canonical initial activities as constant rows:
+# (name, description, schedule, max_participants, participants)
+_ROWS = (
+    ("Basketball", "Team sport focusing on basketball skills and competition",
+     "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
+     15, ("james@mergington.edu",)),
+    ("Tennis Club", "Learn tennis techniques and participate in matches",
+     "Tuesdays and Thursdays, 4:00 PM - 5:00 PM",
+     10, ("sarah@mergington.edu",)),
+    ("Drama Club", "Perform in theatrical productions and develop acting skills",
+     "Wednesdays, 3:30 PM - 5:00 PM",
+     25, ("alex@mergington.edu", "isabella@mergington.edu")),
+    ("Art Studio", "Explore painting, drawing, and other visual arts",
+     "Fridays, 3:30 PM - 5:00 PM",
+     18, ("mia@mergington.edu",)),
+    ("Robotics Club", "Build and program robots for competitions",
+     "Mondays and Thursdays, 3:30 PM - 5:00 PM",
+     16, ("lucas@mergington.edu", "noah@mergington.edu")),
+    ("Debate Team", "Develop public speaking and argumentation skills",
+     "Tuesdays, 3:30 PM - 5:00 PM",
+     12, ("grace@mergington.edu",)),
+    ("Chess Club", "Learn strategies and compete in chess tournaments",
+     "Fridays, 3:30 PM - 5:00 PM",
+     12, ("michael@mergington.edu", "daniel@mergington.edu")),
+    ("Programming Class", "Learn programming fundamentals and build software projects",
+     "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+     20, ("emma@mergington.edu", "sophia@mergington.edu")),
+    ("Gym Class", "Physical education and sports activities",
+     "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+     30, ("john@mergington.edu", "olivia@mergington.edu")),
+)
 
-@pytest.fixture
+
+# URL building blocks shared by the signup and unregister tests
+_BASKETBALL = "/activities/Basketball"
+_NONEXISTENT = "/activities/Nonexistent"
+_SIGNUP = "/signup?email="
+_UNREGISTER = "/unregister?email="
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client"""
-    return TestClient(app)
+    """Create a test client shared across the session"""
+    with TestClient(app) as c:
+        yield c
 
 
 @pytest.fixture
-def reset_activities():
-    """Reset activities to initial state before each test"""
-    original_activities = {
-        "Basketball": {
-            "description": "Team sport focusing on basketball skills and competition",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Tennis Club": {
-            "description": "Learn tennis techniques and participate in matches",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:00 PM",
-            "max_participants": 10,
-            "participants": ["sarah@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Perform in theatrical productions and develop acting skills",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": ["alex@mergington.edu", "isabella@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and other visual arts",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["mia@mergington.edu"]
-        },
-        "Robotics Club": {
-            "description": "Build and program robots for competitions",
-            "schedule": "Mondays and Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["lucas@mergington.edu", "noah@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop public speaking and argumentation skills",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["grace@mergington.edu"]
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+def anyio_backend():
+    """Run async tests on asyncio"""
+    return "asyncio"
+
+
+@pytest.fixture
+async def aclient():
+    """Create an async client dispatching in-process to the ASGI app"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def reset_activities(monkeypatch):
+    """Swap in fresh activities for each test; monkeypatch restores on teardown"""
+    monkeypatch.setattr("app.activities", {
+        name: {
+            "description": description,
+            "schedule": schedule,
+            "max_participants": max_participants,
+            "participants": list(participants),
         }
-    }
-    
-    # Clear current activities
-    activities.clear()
-    # Restore original activities
-    activities.update(original_activities)
-    
-    yield
-    
-    # Reset after test
-    activities.clear()
-    activities.update(original_activities)
+        for name, description, schedule, max_participants, participants in _ROWS
+    })
 
 
-class TestGetActivities:
-    """Test the GET /activities endpoint"""
-    
-    def test_get_activities_returns_all_activities(self, client, reset_activities):
-        """Test that all activities are returned"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 9
-        assert "Basketball" in data
-        assert "Tennis Club" in data
-    
-    def test_activity_has_required_fields(self, client, reset_activities):
-        """Test that each activity has required fields"""
-        response = client.get("/activities")
-        data = response.json()
-        activity = data["Basketball"]
-        
-        assert "description" in activity
-        assert "schedule" in activity
-        assert "max_participants" in activity
-        assert "participants" in activity
-    
-    def test_participants_list_is_present(self, client, reset_activities):
-        """Test that participants list exists"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        assert isinstance(data["Basketball"]["participants"], list)
-        assert "james@mergington.edu" in data["Basketball"]["participants"]
+def test_get_activities(client):
+    """Test that all activities are returned with their required fields"""
+    response = client.get("/activities")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 9
+    assert "Basketball" in data
+    assert "Tennis Club" in data
+    
+    activity = data["Basketball"]
+    assert "description" in activity
+    assert "schedule" in activity
+    assert "max_participants" in activity
+    assert "participants" in activity
+    
+    assert isinstance(activity["participants"], list)
+    assert "james@mergington.edu" in activity["participants"]
 
 
-class TestSignup:
-    """Test the POST /activities/{activity_name}/signup endpoint"""
-    
-    def test_signup_new_participant(self, client, reset_activities):
-        """Test signing up a new participant"""
-        response = client.post(
-            "/activities/Basketball/signup?email=newstudent@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "Signed up" in data["message"]
-        assert "newstudent@mergington.edu" in data["message"]
-    
-    def test_signup_adds_participant_to_activity(self, client, reset_activities):
-        """Test that participant is actually added"""
-        client.post(
-            "/activities/Basketball/signup?email=newstudent@mergington.edu"
-        )
-        
-        response = client.get("/activities")
-        data = response.json()
-        assert "newstudent@mergington.edu" in data["Basketball"]["participants"]
-    
-    def test_signup_duplicate_participant_fails(self, client, reset_activities):
-        """Test that duplicate signup is rejected"""
-        response = client.post(
-            "/activities/Basketball/signup?email=james@mergington.edu"
-        )
-        assert response.status_code == 400
-        data = response.json()
-        assert "already signed up" in data["detail"]
-    
-    def test_signup_nonexistent_activity_fails(self, client, reset_activities):
-        """Test that signup to nonexistent activity fails"""
-        response = client.post(
-            "/activities/Nonexistent/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Activity not found" in data["detail"]
-    
-    def test_signup_multiple_participants(self, client, reset_activities):
-        """Test that multiple participants can sign up"""
-        client.post(
-            "/activities/Basketball/signup?email=student1@mergington.edu"
-        )
-        client.post(
-            "/activities/Basketball/signup?email=student2@mergington.edu"
-        )
-        
-        response = client.get("/activities")
-        data = response.json()
-        participants = data["Basketball"]["participants"]
-        
-        assert "student1@mergington.edu" in participants
-        assert "student2@mergington.edu" in participants
-        assert len(participants) == 3  # original + 2 new
-
-
-class TestUnregister:
-    """Test the DELETE /activities/{activity_name}/unregister endpoint"""
-    
-    def test_unregister_existing_participant(self, client, reset_activities):
-        """Test unregistering an existing participant"""
-        response = client.delete(
-            "/activities/Basketball/unregister?email=james@mergington.edu"
-        )
+def test_signup_new_participant(client):
+    """Test signing up a new participant"""
+    response = client.post(_BASKETBALL + _SIGNUP + "newstudent@mergington.edu")
+    assert response.status_code == 200
+    assert b"Signed up newstudent@mergington.edu" in response.content
+
+
+@pytest.mark.anyio
+async def test_signup_adds_participants(aclient):
+    """Test that participants are actually added across activities"""
+    signups = [
+        ("Basketball", "student1@mergington.edu"),
+        ("Basketball", "student2@mergington.edu"),
+        ("Tennis Club", "student3@mergington.edu"),
+        ("Art Studio", "student4@mergington.edu"),
+    ]
+    responses = await asyncio.gather(*(
+        aclient.post(f"/activities/{activity_name}{_SIGNUP}{email}")
+        for activity_name, email in signups
+    ))
+    for response in responses:
         assert response.status_code == 200
-        data = response.json()
-        assert "Unregistered" in data["message"]
     
-    def test_unregister_removes_participant(self, client, reset_activities):
-        """Test that participant is actually removed"""
-        client.delete(
-            "/activities/Basketball/unregister?email=james@mergington.edu"
-        )
-        
-        response = client.get("/activities")
-        data = response.json()
-        assert "james@mergington.edu" not in data["Basketball"]["participants"]
+    activities = app_module.activities
+    for activity_name, email in signups:
+        assert email in activities[activity_name]["participants"]
+    assert len(activities["Basketball"]["participants"]) == 3  # original + 2 new
+    assert len(activities["Tennis Club"]["participants"]) == 2
+    assert len(activities["Art Studio"]["participants"]) == 2
+
+
+def test_unregister_existing_participant(client):
+    """Test unregistering an existing participant"""
+    response = client.delete(_BASKETBALL + _UNREGISTER + "james@mergington.edu")
+    assert response.status_code == 200
+    assert b"Unregistered james@mergington.edu" in response.content
+
+
+@pytest.mark.parametrize("method, url, status, frag", [
+    ("post", _BASKETBALL + _SIGNUP + "james@mergington.edu",
+     400, b"already signed up"),
+    ("post", _NONEXISTENT + _SIGNUP + "student@mergington.edu",
+     404, b"Activity not found"),
+    ("delete", _BASKETBALL + _UNREGISTER + "notregistered@mergington.edu",
+     400, b"not registered"),
+    ("delete", _NONEXISTENT + _UNREGISTER + "student@mergington.edu",
+     404, b"Activity not found"),
+], ids=[
+    "signup-duplicate-participant",
+    "signup-nonexistent-activity",
+    "unregister-nonexistent-participant",
+    "unregister-nonexistent-activity",
+])
+def test_request_fails(client, method, url, status, frag):
+    """Test that invalid signup and unregister requests are rejected"""
+    response = getattr(client, method)(url)
+    assert response.status_code == status
+    assert frag in response.content
+
+
+def test_unregister_removes_participant(client):
+    """Test that participant is actually removed"""
+    client.delete(_BASKETBALL + _UNREGISTER + "james@mergington.edu")
     
-    def test_unregister_nonexistent_participant_fails(self, client, reset_activities):
-        """Test that unregistering non-registered participant fails"""
-        response = client.delete(
-            "/activities/Basketball/unregister?email=notregistered@mergington.edu"
-        )
-        assert response.status_code == 400
-        data = response.json()
-        assert "not registered" in data["detail"]
+    assert "james@mergington.edu" not in app_module.activities["Basketball"]["participants"]
+
+
+def test_signup_after_unregister(client):
+    """Test that participant can signup again after unregistering"""
+    # Unregister
+    client.delete(_BASKETBALL + _UNREGISTER + "james@mergington.edu")
     
-    def test_unregister_from_nonexistent_activity_fails(self, client, reset_activities):
-        """Test that unregistering from nonexistent activity fails"""
-        response = client.delete(
-            "/activities/Nonexistent/unregister?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Activity not found" in data["detail"]
+    # Sign up again
+    response = client.post(_BASKETBALL + _SIGNUP + "james@mergington.edu")
+    assert response.status_code == 200
     
-    def test_signup_after_unregister(self, client, reset_activities):
-        """Test that participant can signup again after unregistering"""
-        # Unregister
-        client.delete(
-            "/activities/Basketball/unregister?email=james@mergington.edu"
-        )
-        
-        # Sign up again
-        response = client.post(
-            "/activities/Basketball/signup?email=james@mergington.edu"
-        )
-        assert response.status_code == 200
-        
-        # Verify signup
-        response = client.get("/activities")
-        data = response.json()
-        assert "james@mergington.edu" in data["Basketball"]["participants"]
+    # Verify signup
+    assert "james@mergington.edu" in app_module.activities["Basketball"]["participants"]
 
 
-class TestRootRedirect:
-    """Test the root endpoint redirect"""
-    
-    def test_root_redirects_to_static_html(self, client):
-        """Test that root endpoint redirects to static HTML"""
-        response = client.get("/", follow_redirects=False)
-        assert response.status_code == 307
-        assert "/static/index.html" in response.headers["location"]
+def test_root_redirects_to_static_html():
+    """Test that root endpoint redirects to static HTML"""
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/")
+    response = route.endpoint()
+    assert response.status_code == 307
+    assert "/static/index.html" in response.headers["location"]